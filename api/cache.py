@@ -0,0 +1,195 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+# Snapshot of the market data caches, written periodically and on shutdown and
+# bulk-loaded on startup so a restarted process doesn't refetch everything at once.
+# It is an .npz of plain arrays plus a JSON manifest, loaded with allow_pickle=False,
+# so reading a snapshot can never execute code. Warm starts across deploys need
+# CACHE_SNAPSHOT_PATH on a persistent volume (see README).
+SNAPSHOT_PATH = os.environ.get(
+    "CACHE_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "market_cache.npz")
+)
+SNAPSHOT_INTERVAL_SECONDS = int(os.environ.get("CACHE_SNAPSHOT_INTERVAL_SECONDS", "300"))
+SNAPSHOT_VERSION = 3
+
+# Stale entries are refreshed one at a time with this gap between upstream calls
+REFRESH_INTERVAL_SECONDS = 0.5
+
+class TTLCache:
+    """LRU cache whose entries remember when they were stored.
+
+    Entries younger than ttl are fresh. Entries up to max_stale old are still
+    served, but are queued for a background refresh through the cache's
+    refresher instead of being refetched inline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_stale: float,
+        encode: Callable[[Any], tuple],
+        decode: Callable[[Any, dict], Any],
+        max_size: int = 5000
+    ):
+        self.name = name
+        # encode(value) -> (JSON-able metadata, {field: numpy array}); decode reverses it
+        self.encode = encode
+        self.decode = decode
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_size = max_size
+        self.entries = OrderedDict()  # key -> (value, stored_at)
+        # Blocking fetch for one key; run in a worker thread by refresh_worker
+        self.refresher: Optional[Callable[[Any], Any]] = None
+        caches[name] = self
+
+    def get(self, key):
+        """Return the cached value, or None if missing or too old to serve"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        age = time.time() - stored_at
+        if age > self.max_stale:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        if age > self.ttl:
+            schedule_refresh(self, key)
+        return value
+
+    def put(self, key, value, stored_at: Optional[float] = None):
+        self.entries[key] = (value, time.time() if stored_at is None else stored_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def is_stale(self, key) -> bool:
+        entry = self.entries.get(key)
+        return entry is None or time.time() - entry[1] > self.ttl
+
+# Registry of caches included in snapshots, by name
+caches = {}
+
+refresh_queue = deque()
+queued_keys = set()
+
+def schedule_refresh(cache: TTLCache, key):
+    """Queue a stale entry for background refresh, once"""
+    if cache.refresher is None or (cache.name, key) in queued_keys:
+        return
+    queued_keys.add((cache.name, key))
+    refresh_queue.append((cache, key))
+
+async def refresh_worker():
+    """Drain the refresh queue gradually so stale entries don't all hit upstream at once"""
+    while True:
+        if not refresh_queue:
+            await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+            continue
+        cache, key = refresh_queue.popleft()
+        queued_keys.discard((cache.name, key))
+        # A request may have refreshed it in the meantime
+        if cache.is_stale(key):
+            try:
+                cache.put(key, await asyncio.to_thread(cache.refresher, key))
+            except Exception as e:
+                print(f"Background refresh failed for {cache.name} {key}: {e}")
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
+
+def snapshot_entries() -> dict:
+    """Copy of every registered cache's entries, safe to write out while the caches keep changing"""
+    return {name: list(cache.entries.items()) for name, cache in caches.items()}
+
+def save_snapshot(path: str = SNAPSHOT_PATH, entries_by_cache: Optional[dict] = None):
+    """Write every registered cache (or a copy from snapshot_entries) to path atomically"""
+    if entries_by_cache is None:
+        entries_by_cache = snapshot_entries()
+    manifest = {"version": SNAPSHOT_VERSION, "caches": {}}
+    arrays = {}
+    for name, cache_entries in entries_by_cache.items():
+        cache = caches[name]
+        entries = []
+        for key, (value, stored_at) in cache_entries:
+            meta, fields = cache.encode(value)
+            names = {}
+            for field, array in fields.items():
+                names[field] = f"a{len(arrays)}"
+                arrays[names[field]] = array
+            entries.append({"key": key, "stored_at": stored_at, "meta": meta, "arrays": names})
+        manifest["caches"][name] = entries
+    arrays["manifest"] = np.frombuffer(json.dumps(manifest).encode("utf-8"), dtype=np.uint8)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cache-snapshot-", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> int:
+    """Bulk-load a snapshot into the registered caches, keeping each entry's original age.
+
+    Entries past max_stale are dropped and stale ones are queued for background
+    refresh. Returns the number of entries loaded.
+    """
+    if not os.path.exists(path):
+        return 0
+    with np.load(path, allow_pickle=False) as snapshot:
+        manifest = json.loads(snapshot["manifest"].tobytes().decode("utf-8"))
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            return 0
+
+        now = time.time()
+        loaded = 0
+        for name, entries in manifest["caches"].items():
+            cache = caches.get(name)
+            if cache is None:
+                continue
+            for entry in entries:
+                age = now - entry["stored_at"]
+                if age > cache.max_stale:
+                    continue
+                # JSON turns tuple keys into lists
+                key = tuple(entry["key"]) if isinstance(entry["key"], list) else entry["key"]
+                fields = {field: snapshot[array_name] for field, array_name in entry["arrays"].items()}
+                cache.put(key, cache.decode(entry["meta"], fields), entry["stored_at"])
+                loaded += 1
+                if age > cache.ttl:
+                    schedule_refresh(cache, key)
+    return loaded
+
+snapshot_failed = False
+
+def report_snapshot_failure(path: str, error: Exception):
+    """Explain a failed snapshot write once instead of on every attempt"""
+    global snapshot_failed
+    if snapshot_failed:
+        return
+    snapshot_failed = True
+    print(
+        f"Could not write cache snapshot to {path} ({error}); warm start is disabled. "
+        "Set CACHE_SNAPSHOT_PATH to a writable path on a persistent volume to enable it."
+    )
+
+async def snapshot_worker(path: str = SNAPSHOT_PATH):
+    """Write a snapshot every SNAPSHOT_INTERVAL_SECONDS, off the event loop"""
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(save_snapshot, path, snapshot_entries())
+        except Exception as e:
+            report_snapshot_failure(path, e)
@@ -2,11 +2,14 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import uvicorn
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 import os
+import asyncio
 from typing import Optional
 
 # Import routers
-from routers import auth, assets, stocks, accounts, budget
+from routers import auth, assets, stocks, accounts, budget, fx, watchlists
+import cache
 
 app = FastAPI(
     title="WealthFolio API",
@@ -14,6 +17,13 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Railway and Vercel both sit behind an edge proxy, so take the client address
+# from X-Forwarded-For; anonymous quotas are keyed on it
+app.add_middleware(
+    ProxyHeadersMiddleware,
+    trusted_hosts=os.environ.get("FORWARDED_ALLOW_IPS", "*")
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -36,6 +46,28 @@ app.add_middleware(
 # Security
 security = HTTPBearer()
 
+# Warm the market data caches from the last snapshot and keep snapshotting
+background_tasks = []
+
+@app.on_event("startup")
+async def load_cache_snapshot():
+    try:
+        loaded = cache.load_snapshot()
+        print(f"Loaded {loaded} cached entries from {cache.SNAPSHOT_PATH}")
+    except Exception as e:
+        print(f"Could not load cache snapshot: {e}")
+    background_tasks.append(asyncio.create_task(cache.refresh_worker()))
+    background_tasks.append(asyncio.create_task(cache.snapshot_worker()))
+
+@app.on_event("shutdown")
+async def save_cache_snapshot():
+    for task in background_tasks:
+        task.cancel()
+    try:
+        cache.save_snapshot()
+    except Exception as e:
+        cache.report_snapshot_failure(cache.SNAPSHOT_PATH, e)
+
 # Health check
 @app.get("/")
 async def root():
@@ -51,6 +83,8 @@ app.include_router(assets.router, prefix="/api/assets", tags=["Assets"])
 app.include_router(stocks.router, prefix="/api/stocks", tags=["Stocks"])
 app.include_router(accounts.router, prefix="/api/accounts", tags=["Accounts"])
 app.include_router(budget.router, prefix="/api/budget", tags=["Budget"])
+app.include_router(fx.router, prefix="/api/fx", tags=["FX"])
+app.include_router(watchlists.router, prefix="/api/watchlists", tags=["Watchlists"])
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
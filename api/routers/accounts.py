@@ -1,8 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
+from routers.auth import require_quota
+from routers.fx import fx_cache, convert_amounts, CURRENCY_PATTERN
+
 router = APIRouter()
 
 class Account(BaseModel):
@@ -52,27 +56,35 @@ async def get_user_accounts(user_id: str) -> List[Account]:
         return [Account(**account) for account in mock_accounts]
     return []
 
-@router.get("/{user_id}/summary")
-async def get_accounts_summary(user_id: str):
-    """Get summary of accounts (total balance)"""
+@router.get("/{user_id}/summary", dependencies=[Depends(require_quota(1))])
+async def get_accounts_summary(user_id: str, base_currency: str = Query("USD", pattern=CURRENCY_PATTERN)):
+    """Get summary of accounts (total balance converted into base_currency)"""
+    base_currency = base_currency.upper()
     if user_id == "demo":
         accounts = [Account(**account) for account in mock_accounts]
-        total_balance = sum(account.balance for account in accounts)
+        currencies = [account.currency for account in accounts]
+        rates = await run_in_threadpool(fx_cache.get_rates, currencies + [base_currency])
+        converted = convert_amounts([account.balance for account in accounts], currencies, base_currency, rates)
+        total_balance = float(converted.sum())
         
         return {
             "total_balance": round(total_balance, 2),
+            "base_currency": base_currency,
             "accounts_count": len(accounts),
             "accounts": [
                 {
                     "name": account.name,
                     "type": account.type,
-                    "balance": account.balance
+                    "balance": account.balance,
+                    "currency": account.currency,
+                    "converted_balance": round(float(converted_balance), 2)
                 }
-                for account in accounts
+                for account, converted_balance in zip(accounts, converted)
             ]
         }
     return {
         "total_balance": 0,
+        "base_currency": base_currency,
         "accounts_count": 0,
         "accounts": []
     }
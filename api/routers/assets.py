@@ -1,7 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+import numpy as np
+import pandas as pd
+
+from routers.auth import get_request_identity, consume_quota, require_quota
+from routers.fx import fx_cache, convert_amounts, convert_history, CURRENCY_PATTERN
+from routers.stocks import get_price_series, period_start
 
 router = APIRouter()
 
@@ -16,6 +23,7 @@ class StockHolding(BaseModel):
     total_value: float
     gain_loss: float
     gain_loss_percent: float
+    currency: str = "USD"
     last_updated: datetime
 
 class Account(BaseModel):
@@ -133,29 +141,80 @@ async def get_user_holdings(user_id: str) -> List[StockHolding]:
         return [StockHolding(**holding) for holding in mock_holdings]
     return []
 
-@router.get("/holdings/{user_id}/summary")
-async def get_holdings_summary(user_id: str):
-    """Get summary of holdings (total value, gain/loss)"""
+@router.get("/holdings/{user_id}/summary", dependencies=[Depends(require_quota(1))])
+async def get_holdings_summary(user_id: str, base_currency: str = Query("USD", pattern=CURRENCY_PATTERN)):
+    """Get summary of holdings (total value, gain/loss) converted into base_currency"""
+    base_currency = base_currency.upper()
     if user_id == "demo":
         holdings = [StockHolding(**holding) for holding in mock_holdings]
-        total_value = sum(holding.total_value for holding in holdings)
-        total_gain_loss = sum(holding.gain_loss for holding in holdings)
-        total_invested = sum(holding.shares * holding.average_cost for holding in holdings)
+        currencies = [holding.currency for holding in holdings]
+        rates = await run_in_threadpool(fx_cache.get_rates, currencies + [base_currency])
+        
+        # Convert value, gain/loss and cost basis together in one pass
+        amounts = np.array([
+            [holding.total_value, holding.gain_loss, holding.shares * holding.average_cost]
+            for holding in holdings
+        ])
+        converted = convert_amounts(amounts, currencies, base_currency, rates)
+        total_value, total_gain_loss, total_invested = converted.sum(axis=0)
         total_gain_loss_percent = (total_gain_loss / total_invested * 100) if total_invested > 0 else 0
         
         return {
-            "total_value": round(total_value, 2),
-            "total_gain_loss": round(total_gain_loss, 2),
-            "total_gain_loss_percent": round(total_gain_loss_percent, 2),
-            "total_invested": round(total_invested, 2),
-            "holdings_count": len(holdings)
+            "total_value": round(float(total_value), 2),
+            "total_gain_loss": round(float(total_gain_loss), 2),
+            "total_gain_loss_percent": round(float(total_gain_loss_percent), 2),
+            "total_invested": round(float(total_invested), 2),
+            "holdings_count": len(holdings),
+            "base_currency": base_currency
         }
     return {
         "total_value": 0,
         "total_gain_loss": 0,
         "total_gain_loss_percent": 0,
         "total_invested": 0,
-        "holdings_count": 0
+        "holdings_count": 0,
+        "base_currency": base_currency
+    }
+
+@router.get("/holdings/{user_id}/history")
+async def get_holdings_history(
+    user_id: str,
+    period: str = "1Y",
+    base_currency: str = Query("USD", pattern=CURRENCY_PATTERN),
+    identity: str = Depends(get_request_identity)
+):
+    """Get daily portfolio value over a period, converted into base_currency at each day's FX rate"""
+    base_currency = base_currency.upper()
+    holdings = [StockHolding(**holding) for holding in mock_holdings] if user_id == "demo" else []
+    consume_quota(identity, max(len(holdings), 1))
+    
+    # One column per holding: shares times the close, in the holding's currency
+    values = {}
+    currencies = []
+    for holding in holdings:
+        try:
+            series = await get_price_series(holding.symbol)
+        except Exception as e:
+            print(f"Price history unavailable for {holding.symbol}: {e}")
+            continue
+        window = series.since(period_start(series, period))
+        dates = pd.to_datetime(window.timestamp, unit="s", utc=True).tz_convert(window.tz).tz_localize(None).normalize()
+        values[holding.symbol] = pd.Series(window.close * holding.shares, index=dates)
+        currencies.append(holding.currency)
+    
+    if not values:
+        return {"period": period, "base_currency": base_currency, "data": []}
+    
+    # Carry each holding's last close across days another market was open
+    frame = pd.DataFrame(values).sort_index().ffill().dropna()
+    total = (await run_in_threadpool(convert_history, frame, currencies, base_currency)).sum(axis=1)
+    return {
+        "period": period,
+        "base_currency": base_currency,
+        "data": [
+            {"date": date.strftime("%Y-%m-%d"), "value": round(float(value), 2)}
+            for date, value in total.items()
+        ]
     }
 
 # Legacy endpoints (keeping for compatibility)
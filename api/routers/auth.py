@@ -1,21 +1,243 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from pydantic import BaseModel
 from typing import Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from jose import jwt, JWTError
+from passlib.context import CryptContext
+import os
+import secrets
+import time
 
 router = APIRouter()
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-@router.post("/login")
-async def login():
-    # Placeholder for authentication
-    return {"message": "Login endpoint", "token": "placeholder_token"}
+# JWT settings. Without JWT_SECRET_KEY a random per-process secret is used, so
+# tokens stop working on restart but can never be forged from a known default.
+SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
+if not SECRET_KEY:
+    print("JWT_SECRET_KEY is not set; using a random per-process secret")
+    SECRET_KEY = secrets.token_urlsafe(32)
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
-@router.post("/register")
-async def register():
-    # Placeholder for registration
-    return {"message": "Register endpoint"}
+# Verified tokens are kept so signature checks and user lookups aren't repeated per request
+TOKEN_CACHE_SIZE = 1024
+
+# Token-bucket quotas for the upstream-backed market data routes.
+# Anonymous callers are keyed by client IP (the real one, see proxy headers in
+# main.py) and get a smaller bucket; one dashboard load costs about 12 tokens.
+QUOTA_CAPACITY = 120
+QUOTA_REFILL_PER_SECOND = 2.0
+ANONYMOUS_QUOTA_CAPACITY = 60
+ANONYMOUS_QUOTA_REFILL_PER_SECOND = 1.0
+QUOTA_MAX_BUCKETS = 10000
+
+# Login and register hash passwords with bcrypt, so they are charged to the
+# client IP whether or not a token is sent, and the user store is bounded.
+LOGIN_QUOTA_COST = 10
+REGISTER_QUOTA_COST = 30
+MAX_USERS = 1000
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class UserCredentials(BaseModel):
+    username: str
+    password: str
+
+class RegisterRequest(BaseModel):
+    username: str
+    password: str
+    email: Optional[str] = None
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_at: datetime
+
+# Mock user store for demo (in production, this would be a database)
+users_db = {
+    "demo": {
+        "username": "demo",
+        "email": "demo@wealthfolio.app",
+        "hashed_password": pwd_context.hash("demo123"),
+        "created_at": datetime.now()
+    }
+}
+
+class TokenCache:
+    """LRU cache of verified tokens mapped to (user, expiry timestamp)"""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, token: str) -> Optional[dict]:
+        entry = self.entries.get(token)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at <= time.time():
+            del self.entries[token]
+            return None
+        self.entries.move_to_end(token)
+        return user
+
+    def put(self, token: str, user: dict, expires_at: float):
+        self.entries[token] = (user, expires_at)
+        self.entries.move_to_end(token)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+token_cache = TokenCache()
+
+class TokenBucket:
+    """Token bucket that refills continuously up to its capacity"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def consume(self, cost: float) -> float:
+        """Take cost tokens; returns 0 on success, otherwise seconds until enough have refilled"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0
+        return (cost - self.tokens) / self.refill_per_second
+
+quota_buckets = OrderedDict()
+
+def public_user(user: dict) -> dict:
+    """Strip private fields from a stored user"""
+    return {
+        "username": user["username"],
+        "email": user.get("email"),
+        "created_at": user.get("created_at")
+    }
+
+def create_access_token(username: str) -> Token:
+    """Issue a signed JWT for a user"""
+    expires_at = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = jwt.encode({"sub": username, "exp": expires_at}, SECRET_KEY, algorithm=ALGORITHM)
+    return Token(access_token=access_token, expires_at=expires_at)
+
+def verify_token(token: str) -> dict:
+    """Verify a JWT and return its user, using the verified-token cache"""
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
+    credentials_exception = HTTPException(
+        status_code=401,
+        detail="Invalid or expired token",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+
+    username = payload.get("sub")
+    user = users_db.get(username) if username else None
+    if user is None:
+        raise credentials_exception
+
+    token_cache.put(token, user, float(payload["exp"]))
+    return user
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """Dependency resolving the authenticated user from the bearer token"""
+    return verify_token(credentials.credentials)
+
+async def get_client_identity(request: Request) -> str:
+    """Quota identity of the client IP, ignoring any credentials"""
+    host = request.client.host if request.client else "unknown"
+    return f"anon:{host}"
+
+async def get_request_identity(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> str:
+    """Quota identity: the username for authenticated calls, the client IP otherwise.
+
+    Credentials are optional on these routes, so an invalid or expired token
+    falls back to the anonymous identity instead of failing the request.
+    """
+    if credentials is not None:
+        try:
+            return f"user:{verify_token(credentials.credentials)['username']}"
+        except HTTPException:
+            pass
+    return await get_client_identity(request)
+
+def consume_quota(identity: str, cost: float = 1):
+    """Charge cost tokens to an identity's bucket, raising 429 when it is empty.
+
+    A cost larger than the bucket could ever hold is rejected with 413 rather
+    than waited out.
+    """
+    bucket = quota_buckets.get(identity)
+    if bucket is None:
+        if identity.startswith("user:"):
+            bucket = TokenBucket(QUOTA_CAPACITY, QUOTA_REFILL_PER_SECOND)
+        else:
+            bucket = TokenBucket(ANONYMOUS_QUOTA_CAPACITY, ANONYMOUS_QUOTA_REFILL_PER_SECOND)
+        quota_buckets[identity] = bucket
+        while len(quota_buckets) > QUOTA_MAX_BUCKETS:
+            quota_buckets.popitem(last=False)
+    quota_buckets.move_to_end(identity)
+
+    if cost > bucket.capacity:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Request costs {cost:g} quota tokens, more than the limit of {bucket.capacity:g}"
+        )
+    retry_after = bucket.consume(cost)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Request quota exceeded",
+            headers={"Retry-After": str(int(retry_after) + 1)}
+        )
+
+def require_quota(cost: float = 1, identify=get_request_identity):
+    """Route dependency charging a fixed cost to the caller's quota"""
+    async def dependency(identity: str = Depends(identify)) -> str:
+        consume_quota(identity, cost)
+        return identity
+    return dependency
+
+@router.post("/login", dependencies=[Depends(require_quota(LOGIN_QUOTA_COST, get_client_identity))])
+async def login(credentials: UserCredentials) -> Token:
+    """Exchange username and password for an access token"""
+    user = users_db.get(credentials.username)
+    if user is None or not pwd_context.verify(credentials.password, user["hashed_password"]):
+        raise HTTPException(status_code=401, detail="Incorrect username or password")
+    return create_access_token(user["username"])
+
+@router.post("/register", dependencies=[Depends(require_quota(REGISTER_QUOTA_COST, get_client_identity))])
+async def register(request: RegisterRequest) -> Token:
+    """Create a user and return an access token"""
+    if request.username in users_db:
+        raise HTTPException(status_code=400, detail="Username already registered")
+    if len(users_db) >= MAX_USERS:
+        raise HTTPException(status_code=503, detail="Registration is closed")
+    users_db[request.username] = {
+        "username": request.username,
+        "email": request.email,
+        "hashed_password": pwd_context.hash(request.password),
+        "created_at": datetime.now()
+    }
+    return create_access_token(request.username)
 
 @router.get("/me")
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    # Placeholder for getting current user
-    return {"message": "Current user endpoint"} 
\ No newline at end of file
+async def read_current_user(user: dict = Depends(get_current_user)):
+    """Get the authenticated user"""
+    return public_user(user)
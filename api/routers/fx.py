@@ -0,0 +1,230 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+from datetime import datetime, timedelta
+import time
+import re
+import yfinance as yf
+import pandas as pd
+import numpy as np
+
+from routers.auth import require_quota
+
+router = APIRouter()
+
+# Rates are stored as USD per one unit of each currency, so any pair is a ratio of two entries
+PIVOT_CURRENCY = "USD"
+SPOT_TTL_SECONDS = 10 * 60
+HISTORY_TTL_SECONDS = 12 * 60 * 60
+# Currencies Yahoo had no data for aren't asked for again until this passes
+MISS_TTL_SECONDS = 5 * 60
+# Longest history a client may ask for, in days
+MAX_HISTORY_DAYS = 3 * 365
+# ISO 4217 style currency code; used to validate query parameters
+CURRENCY_PATTERN = "^[A-Za-z]{3}$"
+
+# Fallback rates (USD per unit) used when Yahoo Finance is unavailable
+mock_usd_rates = {
+    "USD": 1.0,
+    "EUR": 1.08,
+    "GBP": 1.27,
+    "JPY": 0.0067,
+    "CAD": 0.74,
+    "AUD": 0.66,
+    "CHF": 1.13,
+    "CNY": 0.14,
+    "HKD": 0.128,
+    "INR": 0.012
+}
+
+def fx_ticker(currency: str) -> str:
+    """Yahoo Finance ticker quoting USD per unit of currency"""
+    return f"{currency}{PIVOT_CURRENCY}=X"
+
+def download_closes(currencies: List[str], **kwargs) -> pd.DataFrame:
+    """Download daily closes for several currencies in one batch call, one column per currency"""
+    tickers = [fx_ticker(currency) for currency in currencies]
+    data = yf.download(tickers, interval="1d", progress=False, group_by="column", **kwargs)
+    if data.empty:
+        raise Exception("No FX data returned")
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(tickers[0])
+    closes = closes.rename(columns={fx_ticker(currency): currency for currency in currencies})
+    closes.index = pd.DatetimeIndex(closes.index).tz_localize(None).normalize()
+    return closes.reindex(columns=currencies)
+
+class FxRateCache:
+    """TTL cache of USD-per-unit spot rates and daily rate history, filled in batches"""
+
+    def __init__(self):
+        self.spot = {}  # currency -> (rate, fetched_at)
+        self.history = {}  # currency -> (pd.Series of daily rates, fetched_at)
+        self.misses = {}  # currency -> time of the last fetch that returned nothing
+
+    def recently_missed(self, currency: str, now: float) -> bool:
+        return now - self.misses.get(currency, 0.0) <= MISS_TTL_SECONDS
+
+    def record_misses(self, currencies: List[str], found: List[str], now: float):
+        for currency in currencies:
+            if currency in found:
+                self.misses.pop(currency, None)
+            else:
+                self.misses[currency] = now
+
+    def get_rates(self, currencies: List[str]) -> dict:
+        """Spot rates for the currencies, fetching every missing or stale one in a single call"""
+        now = time.time()
+        currencies = sorted({currency.upper() for currency in currencies})
+        stale = [
+            currency for currency in currencies
+            if currency != PIVOT_CURRENCY
+            and (currency not in self.spot or now - self.spot[currency][1] > SPOT_TTL_SECONDS)
+            and not self.recently_missed(currency, now)
+        ]
+
+        if stale:
+            found = []
+            try:
+                closes = download_closes(stale, period="5d")
+                for currency in stale:
+                    series = closes[currency].dropna()
+                    if not series.empty:
+                        self.spot[currency] = (float(series.iloc[-1]), now)
+                        found.append(currency)
+            except Exception as e:
+                print(f"Yahoo Finance FX API error for {stale}: {e}")
+            self.record_misses(stale, found, now)
+
+        rates = {PIVOT_CURRENCY: 1.0}
+        for currency in currencies:
+            if currency == PIVOT_CURRENCY:
+                continue
+            if currency in self.spot:
+                # A stale rate beats no rate if the refresh failed
+                rates[currency] = self.spot[currency][0]
+            elif currency in mock_usd_rates:
+                rates[currency] = mock_usd_rates[currency]
+            else:
+                raise HTTPException(status_code=404, detail=f"No FX rate for currency {currency}")
+        return rates
+
+    def get_history(self, currencies: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+        """Daily rates (USD per unit) from start to end, one column per currency, gaps forward-filled"""
+        now = time.time()
+        currencies = sorted({currency.upper() for currency in currencies})
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+
+        def covered(currency):
+            if currency not in self.history:
+                return False
+            series, fetched_at = self.history[currency]
+            return now - fetched_at <= HISTORY_TTL_SECONDS and series.index[0] <= start and series.index[-1] >= end - timedelta(days=5)
+
+        missing = [
+            currency for currency in currencies
+            if currency != PIVOT_CURRENCY and not covered(currency) and not self.recently_missed(currency, now)
+        ]
+        if missing:
+            found = []
+            try:
+                # Fetch a week earlier so the first day can be forward-filled across weekends
+                closes = download_closes(missing, start=start - timedelta(days=7), end=end + timedelta(days=1))
+                for currency in missing:
+                    series = closes[currency].dropna()
+                    if not series.empty:
+                        self.history[currency] = (series, now)
+                        # The latest close doubles as a spot rate
+                        self.spot[currency] = (float(series.iloc[-1]), now)
+                        found.append(currency)
+            except Exception as e:
+                print(f"Yahoo Finance FX history API error for {missing}: {e}")
+            self.record_misses(missing, found, now)
+
+        dates = pd.date_range(start, end, freq="D")
+        columns = {}
+        for currency in currencies:
+            if currency == PIVOT_CURRENCY:
+                columns[currency] = pd.Series(1.0, index=dates)
+            elif currency in self.history:
+                series = self.history[currency][0]
+                columns[currency] = series.reindex(series.index.union(dates)).ffill().bfill().reindex(dates)
+            else:
+                # Flat line at the spot rate when no history is available
+                columns[currency] = pd.Series(self.get_rates([currency])[currency], index=dates)
+        return pd.DataFrame(columns, index=dates)
+
+fx_cache = FxRateCache()
+
+def parse_currencies(currencies: str) -> List[str]:
+    """Split a comma-separated list of currency codes, upper-cased and de-duplicated in order"""
+    requested = list(dict.fromkeys(currency.strip().upper() for currency in currencies.split(",") if currency.strip()))
+    invalid = [currency for currency in requested if not re.match(CURRENCY_PATTERN, currency)]
+    if invalid or not requested:
+        raise HTTPException(status_code=422, detail=f"Invalid currency codes: {currencies}")
+    return requested
+
+def convert_amounts(amounts, currencies, base_currency: str, rates: Optional[dict] = None) -> np.ndarray:
+    """Convert amounts in mixed currencies into base_currency in one vectorized pass.
+    
+    amounts may be 1-D (one per currency) or 2-D (one row of several amounts per currency).
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+    currencies = [currency.upper() for currency in currencies]
+    base_currency = base_currency.upper()
+    if rates is None:
+        rates = fx_cache.get_rates(currencies + [base_currency])
+
+    codes, inverse = np.unique(np.asarray(currencies, dtype=str), return_inverse=True)
+    usd_per_unit = np.array([rates[code] for code in codes], dtype=np.float64)
+    factors = usd_per_unit[inverse] / rates[base_currency]
+    return amounts * factors.reshape((-1,) + (1,) * (amounts.ndim - 1))
+
+def convert_history(values: pd.DataFrame, currencies: List[str], base_currency: str) -> pd.DataFrame:
+    """Convert a date-indexed frame (one column per position, each in its own currency) into base_currency"""
+    if values.empty:
+        return values
+    base_currency = base_currency.upper()
+    currencies = [currency.upper() for currency in currencies]
+    dates = pd.DatetimeIndex(values.index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    dates = dates.normalize()
+
+    history = fx_cache.get_history(currencies + [base_currency], dates.min(), dates.max()).reindex(dates)
+    factors = history[currencies].to_numpy() / history[[base_currency]].to_numpy()
+    return pd.DataFrame(values.to_numpy(dtype=np.float64) * factors, index=values.index, columns=values.columns)
+
+@router.get("/rates", dependencies=[Depends(require_quota(1))])
+async def get_fx_rates(currencies: str, base: str = Query("USD", pattern=CURRENCY_PATTERN)):
+    """Get spot rates for comma-separated currencies, quoted as units of base per unit of currency"""
+    requested = parse_currencies(currencies)
+    base = base.upper()
+    # Yahoo Finance calls block, so they run off the event loop
+    rates = await run_in_threadpool(fx_cache.get_rates, requested + [base])
+    return {
+        "base": base,
+        "rates": {currency: rates[currency] / rates[base] for currency in requested},
+        "last_updated": datetime.now()
+    }
+
+@router.get("/history", dependencies=[Depends(require_quota(1))])
+async def get_fx_history(
+    currencies: str,
+    base: str = Query("USD", pattern=CURRENCY_PATTERN),
+    days: int = Query(365, ge=1, le=MAX_HISTORY_DAYS)
+):
+    """Get daily rates for comma-separated currencies over the last N days, quoted in base"""
+    requested = parse_currencies(currencies)
+    base = base.upper()
+    end = datetime.now()
+    history = await run_in_threadpool(fx_cache.get_history, requested + [base], end - timedelta(days=days), end)
+    quoted = history[requested].div(history[base], axis=0)
+    return {
+        "base": base,
+        "data": [
+            {"date": index.strftime("%Y-%m-%d"), **{currency: round(float(row[currency]), 6) for currency in requested}}
+            for index, row in quoted.iterrows()
+        ]
+    }
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from typing import List, Optional
 import requests
 import os
+import asyncio
 from datetime import datetime, timedelta
 import random
 import time
@@ -10,10 +12,17 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 
+from routers.auth import require_quota, get_request_identity, consume_quota
+from cache import TTLCache
+from series import PriceSeries
+
 router = APIRouter()
 
 # NOTE: All live market data is now provided by yfinance (Yahoo Finance). Alpha Vantage is no longer used or referenced in this backend.
 
+# Batch quote requests fan out to one upstream call per symbol
+MAX_QUOTE_SYMBOLS = 50
+
 class StockSymbol(BaseModel):
     symbol: str
 
@@ -27,6 +36,18 @@ class StockData(BaseModel):
     volume: Optional[int] = None
     last_updated: datetime
 
+# Upstream results are cached; entries past their TTL are served while a background refresh runs
+quote_cache = TTLCache(
+    "quotes", ttl=60, max_stale=24 * 60 * 60,
+    encode=lambda quote: (jsonable_encoder(quote), {}),
+    decode=lambda meta, arrays: StockData(**meta)
+)
+history_cache = TTLCache(
+    "history", ttl=10 * 60, max_stale=24 * 60 * 60,
+    encode=PriceSeries.to_snapshot,
+    decode=PriceSeries.from_snapshot
+)
+
 class CryptoData(BaseModel):
     symbol: str
     name: str
@@ -49,17 +70,22 @@ class StockHolding(BaseModel):
     gain_loss_percent: float
     created_at: Optional[datetime] = None
 
-@router.get("/quote/{symbol}")
+@router.get("/quote/{symbol}", dependencies=[Depends(require_quota(1))])
 async def get_stock_quote(symbol: str) -> StockData:
     """Get real-time stock quote using Yahoo Finance (yfinance)"""
+    cached = quote_cache.get(symbol.upper())
+    if cached is not None:
+        return cached
     try:
-        return await get_stock_quote_yahoo(symbol)
+        quote = await asyncio.to_thread(get_stock_quote_yahoo, symbol)
+        quote_cache.put(symbol.upper(), quote)
+        return quote
     except Exception as e:
         print(f"Error fetching stock data for {symbol} from yfinance: {e}")
         return get_mock_stock_data(symbol)
 
-async def get_stock_quote_yahoo(symbol: str) -> StockData:
-    """Get stock quote using Yahoo Finance API"""
+def get_stock_quote_yahoo(symbol: str) -> StockData:
+    """Get stock quote using Yahoo Finance API (blocking; run it in a thread)"""
     try:
         url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol.upper()}"
         headers = {
@@ -90,6 +116,8 @@ async def get_stock_quote_yahoo(symbol: str) -> StockData:
         print(f"Yahoo Finance API error for {symbol}: {e}")
         raise e
 
+quote_cache.refresher = get_stock_quote_yahoo
+
 def get_mock_stock_data(symbol: str) -> StockData:
     """Get mock stock data as fallback"""
     mock_stock_data = {
@@ -120,8 +148,12 @@ def get_mock_stock_data(symbol: str) -> StockData:
     raise HTTPException(status_code=404, detail="Stock symbol not found")
 
 @router.post("/quotes")
-async def get_multiple_quotes(symbols: List[str]) -> List[StockData]:
+async def get_multiple_quotes(symbols: List[str], identity: str = Depends(get_request_identity)) -> List[StockData]:
     """Get quotes for multiple stocks using yfinance"""
+    if len(symbols) > MAX_QUOTE_SYMBOLS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_QUOTE_SYMBOLS} symbols per request")
+    # Each symbol is an upstream call, so charge the quota per symbol
+    consume_quota(identity, max(len(symbols), 1))
     results = []
     for symbol in symbols:
         try:
@@ -131,7 +163,7 @@ async def get_multiple_quotes(symbols: List[str]) -> List[StockData]:
             continue
     return results
 
-@router.get("/trending")
+@router.get("/trending", dependencies=[Depends(require_quota(6))])
 async def get_trending_stocks() -> List[StockData]:
     """Get trending stocks (popular stocks)"""
     # Popular stocks list - in production, this could be dynamic
@@ -147,70 +179,118 @@ async def get_trending_stocks() -> List[StockData]:
     
     return results
 
-@router.get("/history/{symbol}")
-async def get_stock_history(symbol: str, period: str = "3mo") -> dict:
-    """Get historical stock data using Yahoo Finance API with RSI"""
+# Yahoo only serves intraday bars for recent ranges, so each interval is limited
+# to the ranges it can actually be fetched for
+INTRADAY_INTERVAL_RANGES = {
+    "1m": ["1d", "5d"],
+    "5m": ["1d", "5d", "1mo"],
+    "15m": ["1d", "5d", "1mo"]
+}
+
+# Upper bound on the point budget a client may ask for
+MAX_HISTORY_POINTS = 5000
+
+# Daily periods are windows onto one cached 3Y series per symbol
+DAILY_SOURCE_RANGE = "3y"
+PERIOD_WINDOWS = {
+    "1M": pd.DateOffset(months=1),
+    "3M": pd.DateOffset(months=3),
+    "6M": pd.DateOffset(months=6),
+    "1Y": pd.DateOffset(years=1),
+    "3Y": None
+}
+
+@router.get("/history/{symbol}", dependencies=[Depends(require_quota(2))])
+async def get_stock_history(symbol: str, period: str = "3mo", interval: Optional[str] = None, max_points: int = Query(500, ge=3, le=MAX_HISTORY_POINTS), format: str = "points") -> dict:
+    """Get historical stock data using Yahoo Finance API with RSI, downsampled to max_points"""
+    # Map period to Yahoo Finance range and interval
+    period_map = {
+        "1D": {"range": "1d", "interval": "1m"},
+        "5D": {"range": "5d", "interval": "5m"},
+        "1M": {"range": "1mo", "interval": "1d"},
+        "3M": {"range": "3mo", "interval": "1d"},
+        "6M": {"range": "6mo", "interval": "1d"},
+        "YTD": {"range": "ytd", "interval": "1d"},
+        "1Y": {"range": "1y", "interval": "1d"},
+        "3Y": {"range": "3y", "interval": "1d"}
+    }
+    
+    period_config = dict(period_map.get(period, {"range": "3mo", "interval": "1d"}))
+    
+    # Optional intraday override, e.g. period=1M&interval=15m
+    if interval is not None:
+        if interval not in INTRADAY_INTERVAL_RANGES:
+            raise HTTPException(status_code=400, detail=f"Unsupported interval: {interval}")
+        if period_config['range'] not in INTRADAY_INTERVAL_RANGES[interval]:
+            raise HTTPException(status_code=400, detail=f"Interval {interval} is not available for period {period}")
+        period_config['interval'] = interval
+    
+    if format not in ("points", "columns"):
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    
+    intraday = period_config['interval'] in INTRADAY_INTERVAL_RANGES
+    source_range = period_config['range'] if intraday else DAILY_SOURCE_RANGE
+    
     try:
-        # Map period to Yahoo Finance range and interval
-        period_map = {
-            "1M": {"range": "1mo", "interval": "1d"},
-            "3M": {"range": "3mo", "interval": "1d"},
-            "6M": {"range": "6mo", "interval": "1d"},
-            "YTD": {"range": "ytd", "interval": "1d"},
-            "1Y": {"range": "1y", "interval": "1d"},
-            "3Y": {"range": "3y", "interval": "1d"}
-        }
-        
-        period_config = period_map.get(period, {"range": "3mo", "interval": "1d"})
-        
-        # Use yfinance to download data
-        ticker = yf.Ticker(symbol.upper())
-        data = ticker.history(period=period_config['range'], interval=period_config['interval'])
-        
-        if data.empty:
-            raise Exception("No data found for symbol")
-        
-        # Calculate RSI
-        data['RSI'] = calculate_rsi(data['Close'].values)
-        
-        # Convert to format suitable for charts
-        data_points = []
-        for index, row in data.iterrows():
-            data_points.append({
-                'date': index.strftime('%Y-%m-%d'),
-                'timestamp': int(index.timestamp()),
-                'open': round(float(row['Open']), 2),
-                'high': round(float(row['High']), 2),
-                'low': round(float(row['Low']), 2),
-                'close': round(float(row['Close']), 2),
-                'volume': int(row['Volume']),
-                'rsi': round(float(row['RSI']), 2) if pd.notna(row['RSI']) else None
-            })
-        
-        # Calculate day change percentage for tooltips
-        if len(data_points) >= 2:
-            for i in range(1, len(data_points)):
-                prev_close = data_points[i-1]['close']
-                current_close = data_points[i]['close']
-                day_change = current_close - prev_close
-                day_change_percent = (day_change / prev_close * 100) if prev_close > 0 else 0
-                data_points[i]['day_change'] = round(day_change, 2)
-                data_points[i]['day_change_percent'] = round(day_change_percent, 2)
-            # First data point has no previous day
-            data_points[0]['day_change'] = 0
-            data_points[0]['day_change_percent'] = 0
-        
-        return {
-            'symbol': symbol.upper(),
-            'period': period,
-            'data': data_points
-        }
+        series = await get_price_series(symbol, source_range, period_config['interval'])
     except Exception as e:
         print(f"Yahoo Finance Historical API error for {symbol}: {e}")
         # Fallback to mock data
-        return get_mock_historical_data(symbol, period)
+        return get_mock_historical_data(symbol, period, max_points, period_config['interval'])
+    
+    # Window onto the cached series (a view), then reduce to the point budget
+    if not intraday:
+        series = series.since(period_start(series, period))
+    series = series.downsample(max_points)
+    
+    # Convert to the wire format only now
+    date_format = '%Y-%m-%d %H:%M' if intraday else '%Y-%m-%d'
+    return {
+        'symbol': symbol.upper(),
+        'period': period,
+        'interval': period_config['interval'],
+        'data': series.to_columns(date_format) if format == "columns" else series.to_points(date_format)
+    }
+
+def period_start(series: PriceSeries, period: str) -> int:
+    """Epoch timestamp where a daily period's window starts, relative to the last bar"""
+    if len(series) == 0:
+        return 0
+    last = pd.Timestamp(int(series.timestamp[-1]), unit='s', tz='UTC').tz_convert(series.tz).normalize()
+    if period == "YTD":
+        start = last.replace(month=1, day=1)
+    else:
+        offset = PERIOD_WINDOWS.get(period, PERIOD_WINDOWS["3M"])
+        if offset is None:
+            return 0
+        start = last - offset
+    return int(start.timestamp())
+
+async def get_price_series(symbol: str, yahoo_range: str = DAILY_SOURCE_RANGE, interval: str = "1d") -> PriceSeries:
+    """Cached price series for a symbol, fetched from Yahoo Finance on a miss"""
+    key = (symbol.upper(), yahoo_range, interval)
+    series = history_cache.get(key)
+    if series is None:
+        series = await asyncio.to_thread(fetch_price_series, *key)
+        history_cache.put(key, series)
+    return series
+
+def fetch_price_series(symbol: str, yahoo_range: str, interval: str) -> PriceSeries:
+    """Fetch a full price series with RSI from Yahoo Finance, raising on failure (blocking; run it in a thread)"""
+    # Use yfinance to download data
+    ticker = yf.Ticker(symbol)
+    data = ticker.history(period=yahoo_range, interval=interval)
+    
+    if data.empty:
+        raise Exception("No data found for symbol")
+    
+    # Calculate RSI on the full series so windows and downsampling don't distort it
+    data['RSI'] = calculate_rsi(data['Close'].values)
+    return PriceSeries.from_dataframe(data)
+
+history_cache.refresher = lambda key: fetch_price_series(*key)
 
-def get_mock_historical_data(symbol: str, period: str) -> dict:
+def get_mock_historical_data(symbol: str, period: str, max_points: int = 500, interval: str = "1d") -> dict:
     """Get mock historical data as fallback"""
     import random
     from datetime import datetime, timedelta
@@ -230,10 +310,21 @@ def get_mock_historical_data(symbol: str, period: str) -> dict:
         "3Y": 1095
     }
     
-    num_points = point_counts.get(period, 90)
+    # Intraday bars are spaced by the interval over 390-minute trading days
+    intraday_minutes = {"1m": 1, "5m": 5, "15m": 15}
+    intraday_days = {"1D": 1, "5D": 5, "1M": 21}
+    if interval in intraday_minutes:
+        bar_spacing = timedelta(minutes=intraday_minutes[interval])
+        num_points = intraday_days.get(period, 1) * 390 // intraday_minutes[interval]
+        date_format = '%Y-%m-%d %H:%M'
+    else:
+        bar_spacing = timedelta(days=1)
+        num_points = point_counts.get(period, 90)
+        date_format = '%Y-%m-%d'
+    num_points = min(num_points, max_points)
     
     for i in range(num_points):
-        date = current_date - timedelta(days=num_points-i)
+        date = current_date - bar_spacing * (num_points - i)
         
         # Generate realistic price movement
         change = random.uniform(-2, 2)
@@ -250,7 +341,7 @@ def get_mock_historical_data(symbol: str, period: str) -> dict:
         day_change_percent = (day_change / open_price * 100) if open_price > 0 else 0
         
         data_points.append({
-            'date': date.strftime('%Y-%m-%d'),
+            'date': date.strftime(date_format),
             'timestamp': int(date.timestamp()),
             'open': round(open_price, 2),
             'high': round(high_price, 2),
@@ -265,10 +356,11 @@ def get_mock_historical_data(symbol: str, period: str) -> dict:
     return {
         'symbol': symbol.upper(),
         'period': period,
+        'interval': interval,
         'data': data_points
     }
 
-@router.get("/crypto/quote/{symbol}")
+@router.get("/crypto/quote/{symbol}", dependencies=[Depends(require_quota(1))])
 async def get_crypto_quote(symbol: str) -> CryptoData:
     """Get real-time cryptocurrency quote using Yahoo Finance API"""
     try:
@@ -349,7 +441,7 @@ def get_mock_crypto_data(symbol: str) -> CryptoData:
     
     raise HTTPException(status_code=404, detail="Cryptocurrency symbol not found")
 
-@router.get("/crypto/top")
+@router.get("/crypto/top", dependencies=[Depends(require_quota(5))])
 async def get_top_cryptocurrencies() -> List[CryptoData]:
     """Get top 5 cryptocurrencies by market cap"""
     # Top cryptocurrencies by market cap
@@ -417,4 +509,4 @@ def calculate_rsi(prices, period=14):
     # Set first period values to None
     rsi[:period] = None
     
-    return rsi 
\ No newline at end of file
+    return rsi 
@@ -0,0 +1,228 @@
+from fastapi import APIRouter, HTTPException, Depends, Response
+from pydantic import BaseModel
+from typing import List, Optional
+import asyncio
+import secrets
+import time
+
+from routers.auth import get_current_user, consume_quota
+from routers.stocks import get_stock_quote
+
+router = APIRouter()
+
+# Quotes for a watchlist are refreshed from upstream at most this often;
+# syncs in between are answered from the stored quotes
+QUOTE_REFRESH_SECONDS = 15
+# Every symbol is an upstream call per refresh, charged to the owner's quota
+MAX_WATCHLIST_SYMBOLS = 50
+
+# Versions are counters kept in memory, so they restart at 0 with the process.
+# Clients see them as "<epoch>:<n>" tokens; a token from another process has
+# a different epoch and gets a full snapshot instead of a wrong delta.
+VERSION_EPOCH = secrets.token_hex(4)
+
+def parse_version(token: Optional[str]) -> Optional[int]:
+    """Counter from a version token issued by this process, or None if it can't be used"""
+    if not token:
+        return None
+    epoch, _, counter = token.partition(":")
+    if epoch != VERSION_EPOCH or not counter.isdigit():
+        return None
+    return int(counter)
+
+class WatchlistCreate(BaseModel):
+    name: str
+    symbols: List[str] = []
+
+class WatchlistSymbol(BaseModel):
+    symbol: str
+
+class Watchlist:
+    """Server-side watchlist with a version counter bumped on every change.
+
+    Each symbol remembers the version its quote last changed at, and removed
+    symbols leave a tombstone, so a sync only has to send what moved after
+    the client's last seen version.
+    """
+
+    def __init__(self, id: str, user_id: str, name: str, symbols: List[str]):
+        self.id = id
+        self.user_id = user_id
+        self.name = name
+        self.version = 0
+        self.symbols = []
+        self.quotes = {}  # symbol -> StockData
+        self.symbol_versions = {}  # symbol -> version its quote or membership last changed
+        self.removed = {}  # symbol -> version it was removed at
+        self.refreshed_at = 0.0
+        # Serializes refreshes so concurrent syncs fetch upstream and bump the version once
+        self.refresh_lock = asyncio.Lock()
+        for symbol in symbols:
+            self.add_symbol(symbol)
+
+    def add_symbol(self, symbol: str):
+        symbol = symbol.upper()
+        if symbol in self.symbols:
+            return
+        if len(self.symbols) >= MAX_WATCHLIST_SYMBOLS:
+            raise HTTPException(status_code=400, detail=f"Watchlists hold at most {MAX_WATCHLIST_SYMBOLS} symbols")
+        self.version += 1
+        self.symbols.append(symbol)
+        self.symbol_versions[symbol] = self.version
+        self.removed.pop(symbol, None)
+        # Force the next sync to fetch the new symbol
+        self.refreshed_at = 0.0
+
+    def remove_symbol(self, symbol: str):
+        symbol = symbol.upper()
+        if symbol not in self.symbols:
+            raise HTTPException(status_code=404, detail=f"{symbol} is not in watchlist")
+        self.version += 1
+        self.symbols.remove(symbol)
+        self.quotes.pop(symbol, None)
+        self.symbol_versions.pop(symbol, None)
+        self.removed[symbol] = self.version
+
+    async def refresh(self, identity: str):
+        """Fetch quotes from upstream if stale, bumping the version once for everything that moved"""
+        if self.is_fresh():
+            return
+        async with self.refresh_lock:
+            # Another sync may have refreshed while this one waited
+            if self.is_fresh():
+                return
+            await self.fetch_quotes(identity)
+
+    def is_fresh(self) -> bool:
+        return time.time() - self.refreshed_at < QUOTE_REFRESH_SECONDS or not self.symbols
+
+    async def fetch_quotes(self, identity: str):
+        consume_quota(identity, len(self.symbols))
+
+        changed = []
+        # Symbols can be added or removed while quotes are awaited
+        for symbol in list(self.symbols):
+            try:
+                quote = await get_stock_quote(symbol)
+            except Exception:
+                continue
+            if symbol not in self.symbols:
+                continue
+            previous = self.quotes.get(symbol)
+            if previous is None or (previous.price, previous.change, previous.change_percent) != (quote.price, quote.change, quote.change_percent):
+                changed.append(symbol)
+            self.quotes[symbol] = quote
+
+        if changed:
+            self.version += 1
+            for symbol in changed:
+                self.symbol_versions[symbol] = self.version
+        self.refreshed_at = time.time()
+
+    @property
+    def version_token(self) -> str:
+        return f"{VERSION_EPOCH}:{self.version}"
+
+    def delta(self, since_version: Optional[int]) -> dict:
+        """Quotes and removals after since_version, or a full snapshot if the client has no usable version"""
+        full = since_version is None or since_version > self.version
+        if full:
+            since_version = -1
+        return {
+            "id": self.id,
+            "name": self.name,
+            "version": self.version_token,
+            "full": full,
+            "symbols": self.symbols,
+            "quotes": [
+                self.quotes[symbol] for symbol in self.symbols
+                if symbol in self.quotes and self.symbol_versions[symbol] > since_version
+            ],
+            "removed": [symbol for symbol, version in self.removed.items() if version > since_version and not full]
+        }
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "version": self.version_token,
+            "symbols": self.symbols
+        }
+
+# Every user has a default watchlist, created with these symbols on first use
+DEFAULT_WATCHLIST_ID = "1"
+DEFAULT_SYMBOLS = ["AAPL", "GOOGL", "TSLA"]
+
+# Mock watchlist store for demo user (in production, this would be a database)
+watchlists = {
+    ("demo", DEFAULT_WATCHLIST_ID): Watchlist(DEFAULT_WATCHLIST_ID, "demo", "Watchlist", DEFAULT_SYMBOLS)
+}
+
+def get_watchlist_or_404(user_id: str, watchlist_id: str) -> Watchlist:
+    watchlist = watchlists.get((user_id, watchlist_id))
+    if watchlist is None and watchlist_id == DEFAULT_WATCHLIST_ID:
+        watchlist = Watchlist(DEFAULT_WATCHLIST_ID, user_id, "Watchlist", DEFAULT_SYMBOLS)
+        watchlists[(user_id, watchlist_id)] = watchlist
+    if watchlist is None:
+        raise HTTPException(status_code=404, detail="Watchlist not found")
+    return watchlist
+
+def check_owner(user_id: str, user: dict):
+    """Watchlists are private: only the authenticated owner may read or change them"""
+    if user["username"] != user_id:
+        raise HTTPException(status_code=403, detail="Not allowed to access this user's watchlists")
+
+@router.get("/{user_id}")
+async def get_user_watchlists(user_id: str, user: dict = Depends(get_current_user)):
+    """Get all watchlists for a user"""
+    check_owner(user_id, user)
+    return [watchlist.summary() for (owner, _), watchlist in watchlists.items() if owner == user_id]
+
+@router.post("/{user_id}")
+async def create_watchlist(user_id: str, request: WatchlistCreate, user: dict = Depends(get_current_user)):
+    """Create a watchlist"""
+    check_owner(user_id, user)
+    watchlist_id = str(max([int(id) for (_, id) in watchlists.keys()] + [0]) + 1)
+    watchlist = Watchlist(watchlist_id, user_id, request.name, request.symbols)
+    watchlists[(user_id, watchlist_id)] = watchlist
+    return watchlist.summary()
+
+@router.delete("/{user_id}/{watchlist_id}")
+async def delete_watchlist(user_id: str, watchlist_id: str, user: dict = Depends(get_current_user)):
+    """Delete a watchlist"""
+    check_owner(user_id, user)
+    get_watchlist_or_404(user_id, watchlist_id)
+    del watchlists[(user_id, watchlist_id)]
+    return {"message": f"Watchlist {watchlist_id} deleted"}
+
+@router.post("/{user_id}/{watchlist_id}/symbols")
+async def add_watchlist_symbol(user_id: str, watchlist_id: str, request: WatchlistSymbol, user: dict = Depends(get_current_user)):
+    """Add a symbol to a watchlist"""
+    check_owner(user_id, user)
+    watchlist = get_watchlist_or_404(user_id, watchlist_id)
+    watchlist.add_symbol(request.symbol)
+    return watchlist.summary()
+
+@router.delete("/{user_id}/{watchlist_id}/symbols/{symbol}")
+async def remove_watchlist_symbol(user_id: str, watchlist_id: str, symbol: str, user: dict = Depends(get_current_user)):
+    """Remove a symbol from a watchlist"""
+    check_owner(user_id, user)
+    watchlist = get_watchlist_or_404(user_id, watchlist_id)
+    watchlist.remove_symbol(symbol)
+    return watchlist.summary()
+
+@router.get("/{user_id}/{watchlist_id}/sync")
+async def sync_watchlist(
+    user_id: str,
+    watchlist_id: str,
+    since_version: Optional[str] = None,
+    user: dict = Depends(get_current_user)
+):
+    """Get quotes that changed since the client's last seen version token; 304 when nothing did"""
+    check_owner(user_id, user)
+    watchlist = get_watchlist_or_404(user_id, watchlist_id)
+    await watchlist.refresh(f"user:{user['username']}")
+    since = parse_version(since_version)
+    if since is not None and since == watchlist.version:
+        return Response(status_code=304, headers={"ETag": f'"{watchlist.version_token}"'})
+    return watchlist.delta(since)
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+class PriceSeries:
+    """Compact OHLCV + RSI series backed by fixed-width numpy arrays.
+
+    Timestamps are int64 epoch seconds, prices float64 (float32 loses cents on
+    high-priced tickers), RSI float32 and volume int64: 52 bytes per bar.
+    Slicing returns views on the same buffers, so the 1M, 3M and 1Y windows of
+    a cached 3Y series don't copy anything. Bars are only turned into
+    JSON-ready points or columns at response time.
+    """
+
+    __slots__ = ("timestamp", "open", "high", "low", "close", "volume", "rsi", "tz")
+
+    def __init__(self, timestamp, open, high, low, close, volume, rsi, tz: str = "UTC"):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.rsi = rsi
+        self.tz = tz
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame) -> "PriceSeries":
+        """Build from a yfinance history frame with an RSI column"""
+        index = pd.DatetimeIndex(data.index)
+        tz = str(index.tz) if index.tz is not None else "UTC"
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        # Copy every column into its own buffer; to_numpy can return a view that
+        # would keep the frame's whole block (Dividends, Stock Splits, ...) alive
+        return cls(
+            timestamp=np.array(index.as_unit("s").asi8, dtype=np.int64, copy=True),
+            open=np.array(data["Open"].to_numpy(), dtype=np.float64, copy=True),
+            high=np.array(data["High"].to_numpy(), dtype=np.float64, copy=True),
+            low=np.array(data["Low"].to_numpy(), dtype=np.float64, copy=True),
+            close=np.array(data["Close"].to_numpy(), dtype=np.float64, copy=True),
+            # Yahoo leaves Volume empty for some bars (indices, FX, the live bar); NaN would cast to INT64_MIN
+            volume=np.array(data["Volume"].fillna(0).to_numpy(), dtype=np.int64, copy=True),
+            rsi=np.array(data["RSI"].to_numpy(), dtype=np.float32, copy=True),
+            tz=tz
+        )
+
+    def to_snapshot(self) -> tuple:
+        """(metadata, arrays) for the cache snapshot"""
+        arrays = {name: getattr(self, name) for name in self.__slots__ if name != "tz"}
+        return {"tz": self.tz}, arrays
+
+    @classmethod
+    def from_snapshot(cls, meta: dict, arrays: dict) -> "PriceSeries":
+        return cls(tz=meta["tz"], **arrays)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__ if name != "tz")
+
+    def take(self, key) -> "PriceSeries":
+        """Apply a slice (a view) or index array (a copy) to every column"""
+        return PriceSeries(
+            self.timestamp[key], self.open[key], self.high[key], self.low[key],
+            self.close[key], self.volume[key], self.rsi[key], self.tz
+        )
+
+    def since(self, start_timestamp: int) -> "PriceSeries":
+        """Zero-copy view of the bars at or after start_timestamp"""
+        start = int(np.searchsorted(self.timestamp, start_timestamp, side="left"))
+        return self.take(slice(start, None))
+
+    def downsample(self, max_points: int) -> "PriceSeries":
+        """Reduce to at most max_points bars.
+
+        Bars are picked with LTTB on the close so the charted line keeps its
+        shape. Each picked bar absorbs the bars skipped since the previous one:
+        open of the first, max high, min low, summed volume and its own close/RSI.
+        """
+        if not max_points or len(self) <= max_points:
+            return self
+
+        selected = lttb_indices(self.timestamp, self.close, max_points)
+        # Span of bar k is (selected[k-1], selected[k]]; the first bar covers only itself
+        starts = np.concatenate(([0], selected[:-1] + 1))
+
+        result = self.take(selected)
+        result.open = self.open[starts]
+        result.high = np.maximum.reduceat(self.high, starts)
+        result.low = np.minimum.reduceat(self.low, starts)
+        result.volume = np.add.reduceat(self.volume, starts)
+        return result
+
+    def dates(self, date_format: str) -> list:
+        index = pd.to_datetime(self.timestamp, unit="s", utc=True).tz_convert(self.tz)
+        return list(index.strftime(date_format))
+
+    def to_columns(self, date_format: str = "%Y-%m-%d") -> dict:
+        """Columnar wire format: one list per field, with day change between consecutive bars"""
+        close = np.round(self.close, 2)
+        day_change = np.zeros(len(close))
+        day_change_percent = np.zeros(len(close))
+        if len(close) >= 2:
+            # First bar has no previous bar and keeps 0
+            prev_close = close[:-1]
+            day_change[1:] = close[1:] - prev_close
+            with np.errstate(divide="ignore", invalid="ignore"):
+                day_change_percent[1:] = np.where(prev_close > 0, day_change[1:] / prev_close * 100, 0)
+
+        rsi = np.round(self.rsi.astype(np.float64), 2)
+        return {
+            "date": self.dates(date_format),
+            "timestamp": self.timestamp.tolist(),
+            "open": np.round(self.open, 2).tolist(),
+            "high": np.round(self.high, 2).tolist(),
+            "low": np.round(self.low, 2).tolist(),
+            "close": close.tolist(),
+            "volume": self.volume.tolist(),
+            "rsi": [None if np.isnan(value) else value for value in rsi.tolist()],
+            "day_change": np.round(day_change, 2).tolist(),
+            "day_change_percent": np.round(day_change_percent, 2).tolist()
+        }
+
+    def to_points(self, date_format: str = "%Y-%m-%d") -> list:
+        """Chart wire format: one dict per bar"""
+        columns = self.to_columns(date_format)
+        fields = list(columns.keys())
+        return [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+def lttb_indices(x, y, threshold):
+    """Select indices with the largest-triangle-three-buckets algorithm.
+
+    Always keeps the first and last points; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Bucket edges for the n - 2 interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+
+        # Average point of the next bucket (the last point for the final bucket)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) -
+            (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import cache
+import main
+from routers import auth, stocks
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "TSLA", "NVDA"]
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Stub Yahoo Finance and count every upstream call"""
+    calls = []
+
+    def fake_quote(symbol):
+        calls.append(("quote", symbol.upper()))
+        return stocks.StockData(
+            symbol=symbol.upper(), name=symbol.upper(), price=100.0, change=1.0,
+            change_percent=1.0, volume=1000, last_updated=datetime.now()
+        )
+
+    class FakeTicker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, period, interval):
+            calls.append(("history", self.symbol))
+            index = pd.date_range("2023-10-19", periods=756, freq="B", tz="America/New_York")
+            close = np.linspace(90, 110, len(index))
+            return pd.DataFrame(
+                {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000},
+                index=index
+            )
+
+    monkeypatch.setattr(stocks, "get_stock_quote_yahoo", fake_quote)
+    monkeypatch.setattr(stocks.quote_cache, "refresher", fake_quote)
+    monkeypatch.setattr(stocks.yf, "Ticker", FakeTicker)
+    return calls
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    auth.quota_buckets.clear()
+    for registered in cache.caches.values():
+        registered.entries.clear()
+    cache.refresh_queue.clear()
+    cache.queued_keys.clear()
+    yield
+    for registered in cache.caches.values():
+        registered.entries.clear()
+    cache.refresh_queue.clear()
+    cache.queued_keys.clear()
+
+def warm_up(client):
+    for symbol in SYMBOLS:
+        assert client.get(f"/api/stocks/quote/{symbol}").status_code == 200
+        assert client.get(f"/api/stocks/history/{symbol}?period=1Y").status_code == 200
+
+def restart():
+    """Simulate a new process: the in-memory caches start empty"""
+    for registered in cache.caches.values():
+        registered.entries.clear()
+
+def test_warm_start_serves_fresh_entries_without_upstream_calls(upstream, tmp_path):
+    client = TestClient(main.app)
+    warm_up(client)
+    assert len(upstream) == 2 * len(SYMBOLS)
+
+    path = str(tmp_path / "market_cache.npz")
+    cache.save_snapshot(path)
+    restart()
+    upstream.clear()
+
+    started = time.perf_counter()
+    loaded = cache.load_snapshot(path)
+    warm_up(client)
+    time_to_warm = time.perf_counter() - started
+
+    assert loaded == 2 * len(SYMBOLS)
+    assert upstream == []
+    assert not cache.refresh_queue
+    assert time_to_warm < 2.0, f"time to warm {time_to_warm:.3f}s"
+
+def test_warm_start_keeps_age_and_queues_stale_entries(upstream, tmp_path):
+    client = TestClient(main.app)
+    warm_up(client)
+
+    # Age one quote past its TTL but within max_stale
+    value, stored_at = stocks.quote_cache.entries["AAPL"]
+    stocks.quote_cache.entries["AAPL"] = (value, stored_at - stocks.quote_cache.ttl - 5)
+    path = str(tmp_path / "market_cache.npz")
+    cache.save_snapshot(path)
+    restart()
+    upstream.clear()
+
+    cache.load_snapshot(path)
+    assert stocks.quote_cache.entries["AAPL"][1] == pytest.approx(stored_at - stocks.quote_cache.ttl - 5)
+    assert [key for _, key in cache.refresh_queue] == ["AAPL"]
+
+    # The stale quote is still served straight away; only the background worker refetches it
+    assert client.get("/api/stocks/quote/AAPL").json()["price"] == 100.0
+    assert upstream == []
+
+def test_snapshot_round_trips_price_series(upstream, tmp_path):
+    client = TestClient(main.app)
+    before = client.get("/api/stocks/history/AAPL?period=3Y").json()
+
+    path = str(tmp_path / "market_cache.npz")
+    cache.save_snapshot(path)
+    restart()
+    cache.load_snapshot(path)
+
+    assert client.get("/api/stocks/history/AAPL?period=3Y").json() == before
+
+def test_load_snapshot_rejects_pickled_objects(tmp_path):
+    path = tmp_path / "market_cache.npz"
+    np.savez(path, manifest=np.array([object()], dtype=object))
+    with pytest.raises(ValueError):
+        cache.load_snapshot(str(path))
+
+def test_unwritable_snapshot_path_is_reported_once(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(cache, "snapshot_failed", False)
+    monkeypatch.setattr(cache, "SNAPSHOT_INTERVAL_SECONDS", 0)
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    path = str(blocker / "market_cache.npz")
+
+    async def run_worker():
+        worker = asyncio.create_task(cache.snapshot_worker(path))
+        await asyncio.sleep(0.2)
+        worker.cancel()
+
+    asyncio.run(run_worker())
+    output = capsys.readouterr().out
+    assert output.count("warm start is disabled") == 1
@@ -0,0 +1,55 @@
+import numpy as np
+
+from series import PriceSeries, lttb_indices
+
+def linear_series(bars: int) -> PriceSeries:
+    """Daily bars on a straight line, one unit of volume each"""
+    steps = np.arange(bars)
+    close = 100.0 + steps
+    return PriceSeries(
+        timestamp=(1_700_000_000 + steps * 86400).astype(np.int64),
+        open=close - 0.5,
+        high=close + 1,
+        low=close - 1,
+        close=close,
+        volume=np.ones(bars, dtype=np.int64),
+        rsi=np.full(bars, 50, dtype=np.float32)
+    )
+
+def test_lttb_keeps_exact_budget_and_endpoints():
+    rng = np.random.default_rng(0)
+    x = np.arange(1000)
+    y = np.cumsum(rng.normal(size=1000))
+    for threshold in (3, 10, 137, 999):
+        selected = lttb_indices(x, y, threshold)
+        assert len(selected) == threshold
+        assert np.all(np.diff(selected) > 0)
+        assert selected[0] == 0 and selected[-1] == 999
+
+    # Nothing to drop
+    assert lttb_indices(x[:5], y[:5], 5).tolist() == [0, 1, 2, 3, 4]
+
+def test_downsample_folds_skipped_bars_into_picked_ones():
+    series = linear_series(20)
+    result = series.downsample(5)
+
+    assert len(result) == 5
+    assert np.all(np.diff(result.timestamp) > 0)
+    assert result.timestamp[0] == series.timestamp[0]
+    assert result.timestamp[-1] == series.timestamp[-1]
+
+    # On a straight line every triangle is flat, so each bucket keeps its first bar:
+    # bars 0, 1, 7, 13, 19, covering spans [0], [1], [2..7], [8..13], [14..19]
+    starts = [0, 1, 2, 8, 14]
+    picked = [0, 1, 7, 13, 19]
+    assert result.volume.tolist() == [1, 1, 6, 6, 6]
+    assert result.volume.sum() == series.volume.sum()
+    assert result.open.tolist() == series.open[starts].tolist()
+    assert result.high.tolist() == series.high[picked].tolist()
+    assert result.low.tolist() == series.low[starts].tolist()
+    assert result.close.tolist() == series.close[picked].tolist()
+
+def test_downsample_is_a_no_op_within_budget():
+    series = linear_series(20)
+    assert series.downsample(20) is series
+    assert series.downsample(0) is series
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from routers import auth, fx
+
+@pytest.fixture(autouse=True)
+def stub_fx(monkeypatch):
+    """Serve a flat EUR rate instead of calling Yahoo Finance"""
+    def fake_download(currencies, **kwargs):
+        index = pd.date_range(end=pd.Timestamp.now().normalize(), periods=1200, freq="D")
+        return pd.DataFrame({currency: 1.08 for currency in currencies}, index=index)
+
+    monkeypatch.setattr(fx, "download_closes", fake_download)
+    monkeypatch.setattr(fx, "fx_cache", fx.FxRateCache())
+    auth.quota_buckets.clear()
+    yield
+    auth.quota_buckets.clear()
+
+def test_history_dedupes_requested_currencies():
+    client = TestClient(main.app)
+    response = client.get("/api/fx/history", params={"currencies": "EUR,eur, EUR", "days": 7})
+    assert response.status_code == 200
+    rows = response.json()["data"]
+    assert len(rows) == 8
+    assert rows[-1] == {"date": rows[-1]["date"], "EUR": 1.08}
+
+@pytest.mark.parametrize("days", [0, -5, 3_000_000])
+def test_history_rejects_out_of_range_days(days):
+    client = TestClient(main.app)
+    response = client.get("/api/fx/history", params={"currencies": "EUR", "days": days})
+    assert response.status_code == 422
+
+@pytest.mark.parametrize("url", [
+    "/api/fx/rates?currencies=EUR&base=EURO",
+    "/api/fx/rates?currencies=EU1",
+    "/api/accounts/demo/summary?base_currency=../x",
+    "/api/assets/holdings/demo/summary?base_currency=US"
+])
+def test_currency_codes_are_validated(url):
+    assert TestClient(main.app).get(url).status_code == 422
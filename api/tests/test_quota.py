@@ -0,0 +1,43 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+from routers import auth
+
+@pytest.fixture(autouse=True)
+def empty_buckets():
+    auth.quota_buckets.clear()
+    yield
+    auth.quota_buckets.clear()
+
+def test_cost_above_capacity_is_rejected_not_clamped():
+    with pytest.raises(HTTPException) as error:
+        auth.consume_quota("anon:10.0.0.1", auth.ANONYMOUS_QUOTA_CAPACITY + 1)
+    assert error.value.status_code == 413
+    # Nothing was charged
+    assert auth.quota_buckets["anon:10.0.0.1"].tokens == auth.ANONYMOUS_QUOTA_CAPACITY
+
+def test_batch_quotes_are_capped():
+    client = TestClient(main.app)
+    response = client.post("/api/stocks/quotes", json=["AAPL"] * (auth.QUOTA_CAPACITY + 1))
+    assert response.status_code == 413
+
+def test_invalid_token_falls_back_to_anonymous_identity():
+    client = TestClient(main.app)
+    response = client.get("/api/fx/rates?currencies=USD", headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 200
+    assert list(auth.quota_buckets) == ["anon:testclient"]
+
+def test_login_is_charged_to_the_client_ip():
+    client = TestClient(main.app)
+    token = client.post("/api/auth/login", json={"username": "demo", "password": "demo123"}).json()["access_token"]
+    attempts = auth.ANONYMOUS_QUOTA_CAPACITY // auth.LOGIN_QUOTA_COST
+    for _ in range(attempts):
+        response = client.post(
+            "/api/auth/login", json={"username": "demo", "password": "wrong"},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code in (401, 429)
+    assert response.status_code == 429
+    assert "user:demo" not in auth.quota_buckets
@@ -0,0 +1,72 @@
+import gc
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from routers.stocks import calculate_rsi
+from series import PriceSeries
+
+BARS = 756  # 3Y of daily bars
+
+def yfinance_frame(bars: int = BARS) -> pd.DataFrame:
+    """Frame shaped like yfinance history, including the extra columns it returns"""
+    index = pd.date_range("2023-10-19", periods=bars, freq="B", tz="America/New_York")
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(size=bars))
+    data = pd.DataFrame({
+        "Open": close + 0.5,
+        "High": close + 1,
+        "Low": close - 1,
+        "Close": close,
+        "Volume": np.arange(bars, dtype=np.int64) * 1000,
+        "Dividends": 0.0,
+        "Stock Splits": 0.0
+    }, index=index)
+    data["RSI"] = calculate_rsi(data["Close"].values)
+    return data
+
+def retained_bytes(build) -> int:
+    """Bytes still allocated after build() returns and everything else is collected"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return used
+
+def dict_per_bar_layout():
+    """The previous cache layout: one dict per bar"""
+    return PriceSeries.from_dataframe(yfinance_frame()).to_points()
+
+def test_series_columns_own_their_buffers():
+    series = PriceSeries.from_dataframe(yfinance_frame())
+    for name in ("timestamp", "open", "high", "low", "close", "volume", "rsi"):
+        assert getattr(series, name).base is None, f"{name} is a view into the source frame"
+    assert series.nbytes == 52 * BARS
+
+def test_period_windows_share_the_cached_buffer():
+    series = PriceSeries.from_dataframe(yfinance_frame())
+    window = series.since(int(series.timestamp[-60]))
+    assert len(window) == 60
+    assert np.shares_memory(window.close, series.close)
+
+def test_memory_footprint_against_dict_per_bar():
+    series_bytes = retained_bytes(lambda: PriceSeries.from_dataframe(yfinance_frame()))
+    dict_bytes = retained_bytes(dict_per_bar_layout)
+    print(f"\n{BARS} bars: dict-per-bar {dict_bytes / BARS:.0f} B/bar, PriceSeries {series_bytes / BARS:.0f} B/bar")
+
+    # Only the compact buffers survive: 52 B/bar plus small object overhead
+    assert series_bytes < 60 * BARS
+    assert dict_bytes > 8 * series_bytes
+
+def test_missing_volume_becomes_zero():
+    data = yfinance_frame(10)
+    data["Volume"] = data["Volume"].astype(np.float64)
+    data.iloc[[0, 9], data.columns.get_loc("Volume")] = np.nan
+    series = PriceSeries.from_dataframe(data)
+    assert series.volume.dtype == np.int64
+    assert series.volume[0] == 0 and series.volume[9] == 0
+    assert series.volume[1:9].tolist() == data["Volume"].iloc[1:9].astype(np.int64).tolist()
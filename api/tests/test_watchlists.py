@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from routers import auth, stocks, watchlists
+
+@pytest.fixture
+def client(monkeypatch):
+    async def fake_quote(symbol):
+        return stocks.StockData(
+            symbol=symbol, name=symbol, price=100.0, change=1.0,
+            change_percent=1.0, volume=1000, last_updated=datetime.now()
+        )
+
+    monkeypatch.setattr(watchlists, "get_stock_quote", fake_quote)
+    monkeypatch.setattr(watchlists, "watchlists", {})
+    auth.quota_buckets.clear()
+    client = TestClient(main.app)
+    token = client.post("/api/auth/login", json={"username": "demo", "password": "demo123"}).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+    return client
+
+def test_versions_carry_the_process_epoch(client):
+    first = client.get("/api/watchlists/demo/1/sync").json()
+    assert first["full"]
+    assert first["symbols"] == watchlists.DEFAULT_SYMBOLS
+    epoch, counter = first["version"].split(":")
+    assert epoch == watchlists.VERSION_EPOCH
+
+    unchanged = client.get("/api/watchlists/demo/1/sync", params={"since_version": first["version"]})
+    assert unchanged.status_code == 304
+
+    # Same counter from an earlier process: the counters restarted, so send everything
+    restarted = client.get("/api/watchlists/demo/1/sync", params={"since_version": f"stale:{counter}"})
+    assert restarted.status_code == 200
+    assert restarted.json()["full"]
+    assert len(restarted.json()["quotes"]) == len(watchlists.DEFAULT_SYMBOLS)
+
+def test_other_users_only_reach_their_own_watchlists(client):
+    assert client.get("/api/watchlists/someone/1/sync").status_code == 403
@@ -0,0 +1,97 @@
+'use client'
+
+import { useState } from 'react'
+import Link from 'next/link'
+import { useRouter } from 'next/navigation'
+import { TrendingUp } from 'lucide-react'
+import { apiService } from '@/lib/api'
+import { Button } from '@/components/ui/button'
+import { Input } from '@/components/ui/input'
+import { Label } from '@/components/ui/label'
+import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
+
+export default function LoginPage() {
+  const router = useRouter()
+  const [username, setUsername] = useState('')
+  const [password, setPassword] = useState('')
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+
+  const handleSubmit = async (e: React.FormEvent) => {
+    e.preventDefault()
+    if (!username.trim() || !password) {
+      setError('Username and password are required')
+      return
+    }
+
+    setLoading(true)
+    setError(null)
+    try {
+      await apiService.login(username.trim(), password)
+      router.push('/dashboard')
+    } catch (error) {
+      console.error('Login failed:', error)
+      setError('Incorrect username or password')
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-blue-50 to-white flex flex-col items-center justify-center px-6">
+      <Link href="/" className="flex items-center space-x-2 mb-8">
+        <TrendingUp className="h-8 w-8 text-blue-600" />
+        <span className="text-2xl font-bold text-gray-900">WealthFolio</span>
+      </Link>
+
+      <Card className="w-full max-w-md">
+        <CardHeader>
+          <CardTitle>Sign In</CardTitle>
+          <CardDescription>
+            Sign in to keep your watchlists in sync. Try demo / demo123.
+          </CardDescription>
+        </CardHeader>
+        <CardContent>
+          <form onSubmit={handleSubmit} className="space-y-4">
+            <div className="space-y-2">
+              <Label htmlFor="username">Username</Label>
+              <Input
+                id="username"
+                type="text"
+                autoComplete="username"
+                value={username}
+                onChange={(e) => setUsername(e.target.value)}
+                disabled={loading}
+              />
+            </div>
+
+            <div className="space-y-2">
+              <Label htmlFor="password">Password</Label>
+              <Input
+                id="password"
+                type="password"
+                autoComplete="current-password"
+                value={password}
+                onChange={(e) => setPassword(e.target.value)}
+                disabled={loading}
+              />
+            </div>
+
+            {error && (
+              <p className="text-sm text-red-600">{error}</p>
+            )}
+
+            <div className="flex space-x-2 pt-4">
+              <Button type="submit" disabled={loading} className="flex-1">
+                {loading ? 'Signing in...' : 'Sign In'}
+              </Button>
+              <Button type="button" variant="outline" asChild>
+                <Link href="/dashboard">View Demo</Link>
+              </Button>
+            </div>
+          </form>
+        </CardContent>
+      </Card>
+    </div>
+  )
+}
@@ -1,7 +1,7 @@
 'use client'
 
 import { useState, useEffect } from 'react'
-import { cn, formatCurrency, formatPercent } from '@/lib/utils'
+import { cn, formatCurrency, formatPercent, formatChartTick } from '@/lib/utils'
 import { TrendingUp, TrendingDown, Coins, RefreshCw, X } from 'lucide-react'
 import { apiService, CryptoData, HistoricalData } from '@/lib/api'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
@@ -233,7 +233,7 @@ export function Cryptocurrencies() {
             
             {/* Time Period Selector */}
             <div className="flex space-x-2 mb-4">
-              {['1M', '3M', '6M', 'YTD', '1Y', '3Y'].map((period) => (
+              {['1D', '5D', '1M', '3M', '6M', 'YTD', '1Y', '3Y'].map((period) => (
                 <Button
                   key={period}
                   variant={period === selectedPeriod ? 'default' : 'outline'}
@@ -266,10 +266,7 @@ export function Cryptocurrencies() {
                           dataKey="date" 
                           stroke="#6b7280"
                           fontSize={12}
-                          tickFormatter={(value) => {
-                            const date = new Date(value)
-                            return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-                          }}
+                          tickFormatter={(value) => formatChartTick(value, chartData)}
                         />
                         <YAxis 
                           stroke="#6b7280"
@@ -300,10 +297,7 @@ export function Cryptocurrencies() {
                           dataKey="date" 
                           stroke="#6b7280"
                           fontSize={10}
-                          tickFormatter={(value) => {
-                            const date = new Date(value)
-                            return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-                          }}
+                          tickFormatter={(value) => formatChartTick(value, chartData)}
                         />
                         <YAxis 
                           stroke="#6b7280"
@@ -1,7 +1,7 @@
 'use client'
 
 import { useState, useEffect } from 'react'
-import { cn, formatCurrency, formatPercent } from '@/lib/utils'
+import { cn, formatCurrency, formatPercent, formatChartTick } from '@/lib/utils'
 import { TrendingUp, TrendingDown, BarChart3, RefreshCw, X } from 'lucide-react'
 import { apiService, StockData, HistoricalData } from '@/lib/api'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
@@ -234,7 +234,7 @@ export function MarketIndices() {
             
             {/* Time Period Selector */}
             <div className="flex space-x-2 mb-4">
-              {['1M', '3M', '6M', 'YTD', '1Y', '3Y'].map((period) => (
+              {['1D', '5D', '1M', '3M', '6M', 'YTD', '1Y', '3Y'].map((period) => (
                 <Button
                   key={period}
                   variant={period === '3M' ? 'default' : 'outline'}
@@ -267,10 +267,7 @@ export function MarketIndices() {
                           dataKey="date" 
                           stroke="#6b7280"
                           fontSize={12}
-                          tickFormatter={(value) => {
-                            const date = new Date(value)
-                            return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-                          }}
+                          tickFormatter={(value) => formatChartTick(value, chartData)}
                         />
                         <YAxis 
                           stroke="#6b7280"
@@ -301,10 +298,7 @@ export function MarketIndices() {
                           dataKey="date" 
                           stroke="#6b7280"
                           fontSize={10}
-                          tickFormatter={(value) => {
-                            const date = new Date(value)
-                            return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-                          }}
+                          tickFormatter={(value) => formatChartTick(value, chartData)}
                         />
                         <YAxis 
                           stroke="#6b7280"
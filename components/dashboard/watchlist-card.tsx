@@ -1,11 +1,12 @@
 'use client'
 
 import React, { useState, useEffect } from 'react'
-import { cn, formatCurrency, formatPercent } from '@/lib/utils'
+import Link from 'next/link'
+import { cn, formatCurrency, formatPercent, formatChartTick } from '@/lib/utils'
 import { TrendingUp, TrendingDown, Plus, X, RefreshCw } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
-import { apiService, StockData, HistoricalData } from '@/lib/api'
+import { apiService, StockData, HistoricalData, WatchlistSync } from '@/lib/api'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Label } from '@/components/ui/label'
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts'
@@ -21,9 +22,10 @@ interface WatchlistStock {
 
 interface WatchlistCardProps {
   title?: string
+  watchlistId?: string
 }
 
-export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProps) {
+export default function WatchlistCard({ title = "Watchlist", watchlistId = "1" }: WatchlistCardProps) {
   const [watchlistStocks, setWatchlistStocks] = useState<WatchlistStock[]>([
     {
       ticker: 'AAPL',
@@ -58,6 +60,10 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
   const [selectedPeriod, setSelectedPeriod] = useState('3M')
   const [chartData, setChartData] = useState<HistoricalData | null>(null)
   const [chartLoading, setChartLoading] = useState(false)
+  // Last server watchlist version seen; undefined until the first sync (or when the server is unavailable)
+  const [watchlistVersion, setWatchlistVersion] = useState<string | undefined>(undefined)
+  // Signed-in user owning the server-side watchlist; undefined until read on mount
+  const [username, setUsername] = useState<string | null | undefined>(undefined)
 
   const getStockIcon = (symbol: string) => {
     const icons: { [key: string]: string } = {
@@ -75,30 +81,67 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
     return icons[symbol] || '📈'
   }
 
-  const refreshPrices = async () => {
+  const applyQuotes = (quotes: StockData[]) => {
+    setWatchlistStocks(prevStocks => {
+      return prevStocks.map(stock => {
+        const quote = quotes.find(q => q.symbol === stock.ticker)
+        if (quote) {
+          return {
+            ...stock,
+            company: quote.name,
+            price: quote.price,
+            change: quote.change,
+            changePercent: quote.change_percent
+          }
+        }
+        return stock
+      })
+    })
+  }
+
+  const applySync = (sync: WatchlistSync) => {
+    setWatchlistStocks(prevStocks => {
+      // Keep the server's symbol order, reusing known rows and adding placeholders for new symbols
+      const known = sync.full ? prevStocks : prevStocks.filter(stock => !sync.removed.includes(stock.ticker))
+      return sync.symbols.map(ticker => {
+        const existing = known.find(stock => stock.ticker === ticker)
+        const quote = sync.quotes.find(q => q.symbol === ticker)
+        const stock = existing || { ticker, company: ticker, price: 0, change: 0, changePercent: 0, icon: getStockIcon(ticker) }
+        if (!quote) return stock
+        return {
+          ...stock,
+          company: quote.name,
+          price: quote.price,
+          change: quote.change,
+          changePercent: quote.change_percent
+        }
+      })
+    })
+    setWatchlistVersion(sync.version)
+  }
+
+  // Server-side watchlists need a signed-in user; otherwise the list stays local
+  const refreshPrices = async (fullSync = false) => {
     setError(null)
     setLoading(true)
     try {
+      if (typeof username === 'string') {
+        try {
+          // Only quotes that changed since our version come back
+          const sync = await apiService.syncWatchlist(username, watchlistId, fullSync ? undefined : watchlistVersion)
+          if (sync) applySync(sync)
+          return
+        } catch (syncError) {
+          console.error('Watchlist sync unavailable, falling back to full quote refresh:', syncError)
+          setWatchlistVersion(undefined)
+        }
+      }
+
       const symbols = watchlistStocks.map(stock => stock.ticker)
       if (symbols.length === 0) return
       
       const quotes = await apiService.getMultipleQuotes(symbols)
-      
-      setWatchlistStocks(prevStocks => {
-        return prevStocks.map(stock => {
-          const quote = quotes.find(q => q.symbol === stock.ticker)
-          if (quote) {
-            return {
-              ...stock,
-              company: quote.name,
-              price: quote.price,
-              change: quote.change,
-              changePercent: quote.change_percent
-            }
-          }
-          return stock
-        })
-      })
+      applyQuotes(quotes)
     } catch (error) {
       console.error('Error refreshing prices:', error)
       setError('Failed to refresh prices')
@@ -107,6 +150,18 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
     }
   }
 
+  useEffect(() => {
+    setUsername(apiService.getUsername())
+    return apiService.onAuthChange(() => setUsername(apiService.getUsername()))
+  }, [])
+
+  // Load the server's list (or fresh local quotes) on mount and whenever the user signs in or out
+  useEffect(() => {
+    if (username === undefined) return
+    setWatchlistVersion(undefined)
+    refreshPrices(true)
+  }, [username])
+
   const addStock = async () => {
     if (!newStockSymbol.trim()) return
     
@@ -114,6 +169,10 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
     setError(null)
     try {
       const stockQuote = await apiService.getStockQuote(newStockSymbol.trim())
+      // Edits always go to the server first so a later full sync can't drop them
+      if (typeof username === 'string') {
+        await apiService.addWatchlistSymbol(username, watchlistId, stockQuote.symbol)
+      }
       
       const newStock: WatchlistStock = {
         ticker: stockQuote.symbol,
@@ -134,7 +193,17 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
     }
   }
 
-  const removeStock = (ticker: string) => {
+  const removeStock = async (ticker: string) => {
+    setError(null)
+    if (typeof username === 'string') {
+      try {
+        await apiService.removeWatchlistSymbol(username, watchlistId, ticker)
+      } catch (error) {
+        console.error('Error removing symbol from server watchlist:', error)
+        setError('Failed to remove stock')
+        return
+      }
+    }
     setWatchlistStocks(prev => prev.filter(stock => stock.ticker !== ticker))
   }
 
@@ -198,7 +267,7 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
             <Button
               variant="ghost"
               size="sm"
-              onClick={refreshPrices}
+              onClick={() => refreshPrices()}
               disabled={loading}
               className="h-8 w-8 p-0"
             >
@@ -216,6 +285,12 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
         </CardHeader>
 
         <CardContent className="space-y-4">
+          {username === null && (
+            <p className="text-xs text-gray-500">
+              <Link href="/auth/login" className="text-blue-600 hover:underline">Sign in</Link> to keep this watchlist in sync across devices.
+            </p>
+          )}
+
           {/* Add Stock Form */}
           {showAddForm && (
             <div className="flex items-center space-x-2">
@@ -345,7 +420,7 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
             
             {/* Time Period Selector */}
             <div className="flex space-x-2 mb-4">
-              {['1M', '3M', '6M', 'YTD', '1Y', '3Y'].map((period) => (
+              {['1D', '5D', '1M', '3M', '6M', 'YTD', '1Y', '3Y'].map((period) => (
                 <Button
                   key={period}
                   variant={period === '3M' ? 'default' : 'outline'}
@@ -378,10 +453,7 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
                           dataKey="date" 
                           stroke="#6b7280"
                           fontSize={12}
-                          tickFormatter={(value) => {
-                            const date = new Date(value)
-                            return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-                          }}
+                          tickFormatter={(value) => formatChartTick(value, chartData)}
                         />
                         <YAxis 
                           stroke="#6b7280"
@@ -412,10 +484,7 @@ export default function WatchlistCard({ title = "Watchlist" }: WatchlistCardProp
                           dataKey="date" 
                           stroke="#6b7280"
                           fontSize={10}
-                          tickFormatter={(value) => {
-                            const date = new Date(value)
-                            return date.toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-                          }}
+                          tickFormatter={(value) => formatChartTick(value, chartData)}
                         />
                         <YAxis 
                           stroke="#6b7280"
@@ -1,9 +1,10 @@
 'use client'
 
-import { useState } from 'react'
+import { useState, useEffect } from 'react'
 import Link from 'next/link'
 import { usePathname } from 'next/navigation'
 import { cn } from '@/lib/utils'
+import { apiService } from '@/lib/api'
 import { 
   LayoutDashboard, 
   TrendingUp,
@@ -12,13 +13,14 @@ import {
   Target,
   CreditCard,
   Settings,
-  ChevronDown,
   Search,
   Bell,
   Moon,
   User,
   ChevronLeft,
-  ChevronRight
+  ChevronRight,
+  LogIn,
+  LogOut
 } from 'lucide-react'
 
 const navigation = [
@@ -58,6 +60,12 @@ export function Sidebar() {
   const pathname = usePathname()
   const [openItems, setOpenItems] = useState<string[]>([])
   const [collapsed, setCollapsed] = useState(false)
+  const [username, setUsername] = useState<string | null>(null)
+
+  useEffect(() => {
+    setUsername(apiService.getUsername())
+    return apiService.onAuthChange(() => setUsername(apiService.getUsername()))
+  }, [])
 
   const toggleItem = (name: string) => {
     setOpenItems(prev => 
@@ -154,15 +162,33 @@ export function Sidebar() {
       <div className={cn("border-t border-gray-200 p-6 transition-all duration-200", collapsed && "p-2 border-t-0")}> 
         <div className="flex items-center space-x-3 justify-between">
           <div className={cn("h-8 w-8 rounded-full bg-blue-600 flex items-center justify-center", collapsed && "mx-auto")}> 
-            <span className="text-sm font-medium text-white">U</span>
+            <span className="text-sm font-medium text-white">{username ? username[0].toUpperCase() : 'U'}</span>
           </div>
           {!collapsed && (
             <div className="min-w-0 flex-1">
-              <p className="text-sm font-medium text-gray-900">User</p>
+              <p className="text-sm font-medium text-gray-900 truncate">{username ?? 'Guest'}</p>
               <p className="text-xs text-gray-500">Free Plan</p>
             </div>
           )}
-          {!collapsed && <ChevronDown className="h-4 w-4 text-gray-400" />}
+          {!collapsed && (username ? (
+            <button
+              className="p-1.5 text-gray-400 hover:text-gray-500 focus:outline-none"
+              onClick={() => apiService.logout()}
+              aria-label="Sign out"
+              title="Sign out"
+            >
+              <LogOut className="h-4 w-4" />
+            </button>
+          ) : (
+            <Link
+              href="/auth/login"
+              className="p-1.5 text-gray-400 hover:text-gray-500"
+              aria-label="Sign in"
+              title="Sign in"
+            >
+              <LogIn className="h-4 w-4" />
+            </Link>
+          ))}
         </div>
       </div>
     </div>
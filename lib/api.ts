@@ -78,9 +78,21 @@ export interface HistoricalDataPoint {
   rsi?: number
 }
 
+export interface WatchlistSync {
+  id: string
+  name: string
+  // Opaque "<epoch>:<n>" token; pass it back as-is on the next sync
+  version: string
+  full: boolean
+  symbols: string[]
+  quotes: StockData[]
+  removed: string[]
+}
+
 export interface HistoricalData {
   symbol: string
   period: string
+  interval?: string
   data: HistoricalDataPoint[]
 }
 
@@ -155,12 +167,90 @@ const mockStockData: { [key: string]: StockData } = {
 class ApiService {
   private baseUrl: string
   private useMockData: boolean = false
+  private authToken: string | null = null
+  private authUser: string | null = null
+  private authListeners = new Set<() => void>()
 
   constructor() {
     this.baseUrl = API_BASE_URL
+    if (typeof window !== 'undefined') {
+      this.authToken = window.localStorage.getItem('authToken')
+      this.authUser = window.localStorage.getItem('authUser')
+    }
     console.log('API Service initialized with base URL:', this.baseUrl)
   }
 
+  isAuthenticated(): boolean {
+    return this.authToken !== null
+  }
+
+  // Username of the signed-in user, or null when anonymous
+  getUsername(): string | null {
+    return this.authToken !== null ? this.authUser : null
+  }
+
+  // Called whenever the user signs in or out (including a rejected token being dropped)
+  onAuthChange(listener: () => void): () => void {
+    this.authListeners.add(listener)
+    return () => {
+      this.authListeners.delete(listener)
+    }
+  }
+
+  async login(username: string, password: string): Promise<void> {
+    this.logout()
+    const result = await this.request<{ access_token: string }>('/api/auth/login', {
+      method: 'POST',
+      body: JSON.stringify({ username, password }),
+    })
+    this.setAuth(result.access_token, username)
+  }
+
+  logout(): void {
+    this.setAuth(null, null)
+  }
+
+  private setAuth(token: string | null, username: string | null): void {
+    const changed = token !== this.authToken
+    this.authToken = token
+    this.authUser = username
+    if (typeof window !== 'undefined') {
+      if (token && username) {
+        window.localStorage.setItem('authToken', token)
+        window.localStorage.setItem('authUser', username)
+      } else {
+        window.localStorage.removeItem('authToken')
+        window.localStorage.removeItem('authUser')
+      }
+    }
+    if (changed) {
+      this.authListeners.forEach(listener => listener())
+    }
+  }
+
+  private authHeaders(): Record<string, string> {
+    return this.authToken ? { Authorization: `Bearer ${this.authToken}` } : {}
+  }
+
+  // Sends the stored token if there is one. A 401 means it expired or was signed
+  // by another server process, so it is dropped and the request retried anonymously.
+  private async fetchWithAuth(url: string, options?: RequestInit): Promise<Response> {
+    const send = () => fetch(url, {
+      ...options,
+      headers: {
+        'Content-Type': 'application/json',
+        ...this.authHeaders(),
+        ...options?.headers,
+      },
+    })
+    const response = await send()
+    if (response.status === 401 && this.authToken) {
+      this.logout()
+      return await send()
+    }
+    return response
+  }
+
   private async checkBackendHealth(): Promise<boolean> {
     try {
       console.log('Checking backend health at:', `${this.baseUrl}/health`)
@@ -179,13 +269,7 @@ class ApiService {
   private async request<T>(endpoint: string, options?: RequestInit): Promise<T> {
     const url = `${this.baseUrl}${endpoint}`
     try {
-      const response = await fetch(url, {
-        headers: {
-          'Content-Type': 'application/json',
-          ...options?.headers,
-        },
-        ...options,
-      })
+      const response = await this.fetchWithAuth(url, options)
       if (!response.ok) {
         throw new Error(`API request failed: ${response.status} ${response.statusText}`)
       }
@@ -328,14 +412,40 @@ class ApiService {
     }
   }
 
-  async getStockHistory(symbol: string, period: string = '3M'): Promise<HistoricalData> {
+  async getStockHistory(symbol: string, period: string = '3M', maxPoints: number = 500): Promise<HistoricalData> {
     try {
-      return await this.request<HistoricalData>(`/api/stocks/history/${symbol}?period=${period}`)
+      return await this.request<HistoricalData>(`/api/stocks/history/${symbol}?period=${period}&max_points=${maxPoints}`)
     } catch (error) {
       console.error('Error fetching stock history:', error)
       throw error
     }
   }
+
+  // Returns null when nothing changed since sinceVersion (server replies 304)
+  async syncWatchlist(userId: string, watchlistId: string, sinceVersion?: string): Promise<WatchlistSync | null> {
+    const query = sinceVersion !== undefined ? `?since_version=${encodeURIComponent(sinceVersion)}` : ''
+    const response = await this.fetchWithAuth(`${this.baseUrl}/api/watchlists/${userId}/${watchlistId}/sync${query}`)
+    if (response.status === 304) {
+      return null
+    }
+    if (!response.ok) {
+      throw new Error(`API request failed: ${response.status} ${response.statusText}`)
+    }
+    return await response.json()
+  }
+
+  async addWatchlistSymbol(userId: string, watchlistId: string, symbol: string): Promise<void> {
+    await this.request(`/api/watchlists/${userId}/${watchlistId}/symbols`, {
+      method: 'POST',
+      body: JSON.stringify({ symbol }),
+    })
+  }
+
+  async removeWatchlistSymbol(userId: string, watchlistId: string, symbol: string): Promise<void> {
+    await this.request(`/api/watchlists/${userId}/${watchlistId}/symbols/${symbol}`, {
+      method: 'DELETE',
+    })
+  }
 }
 
 export const apiService = new ApiService()
\ No newline at end of file
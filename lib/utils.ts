@@ -18,4 +18,20 @@ export function formatPercent(value: number): string {
     minimumFractionDigits: 2,
     maximumFractionDigits: 2,
   }).format(value / 100)
-} 
\ No newline at end of file
+} 
+
+const INTRADAY_INTERVALS = ['1m', '5m', '15m']
+
+// Chart x-axis label for a bar date ("YYYY-MM-DD", or "YYYY-MM-DD HH:MM" for
+// intraday bars, already in the exchange's time zone). Intraday charts show the
+// time, prefixed with the day when the chart spans several days.
+export function formatChartTick(value: string, chart: { interval?: string; data: { date: string }[] }): string {
+  const [day, time] = value.split(' ')
+  const label = new Date(`${day}T00:00:00`).toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
+  if (!time || !INTRADAY_INTERVALS.includes(chart.interval ?? '')) {
+    return label
+  }
+  const firstDay = chart.data[0]?.date.slice(0, 10)
+  const lastDay = chart.data[chart.data.length - 1]?.date.slice(0, 10)
+  return firstDay === lastDay ? time : `${label} ${time}`
+}